@@ -9,10 +9,45 @@ and generates JSON, HTML, and console reports.
 import os
 import sys
 import json
+import math
 import argparse
 import requests
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, List, Tuple
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup; fall back to the stdlib
+    orjson = None
+
+if orjson is not None:
+    _loads = orjson.loads
+else:
+    _loads = json.loads
+
+# Shared HTTP session so all API calls reuse pooled keep-alive connections
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+# Issues and measures payloads are repetitive JSON that compresses well
+SESSION.headers.update({"Accept-Encoding": "gzip, deflate"})
+
+# SonarQube's maximum page size for api/issues/search, and the most results
+# it will page through before rejecting further requests
+ISSUES_PAGE_SIZE = 500
+ISSUES_MAX_RESULTS = 10000
+
+# Source files referenced by issues are looked up under sample-project/
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_SAMPLE_ROOT = os.path.join(_PROJECT_ROOT, "sample-project")
+
+# Escapes values interpolated into the HTML report in a single pass
+_HTML_ESCAPE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#x27;'})
 
 # ANSI color codes for console output
 class Colors:
@@ -24,121 +59,231 @@ class Colors:
     BOLD = '\033[1m'
 
 
-def fetch_quality_gate_status(host: str, auth_tuple, project_key: str) -> Dict[str, Any]:
+# Quality gate status and issue severity presentation lookups
+STATUS_COLOR = {
+    "OK": "#4CAF50",
+    "ERROR": "#F44336",
+    "WARN": "#FF9800",
+    "NONE": "#9E9E9E"
+}
+
+STATUS_EMOJI = {
+    "OK": "✅",
+    "ERROR": "❌",
+    "WARN": "⚠️",
+    "NONE": "⚪"
+}
+
+SEVERITY_COLORS = {
+    "BLOCKER": Colors.RED,
+    "CRITICAL": Colors.RED,
+    "MAJOR": Colors.YELLOW,
+    "MINOR": Colors.BLUE,
+    "INFO": Colors.BLUE
+}
+
+
+def _get_json(session: requests.Session, url: str, params: Dict[str, Any], auth_tuple) -> Dict[str, Any]:
+    """GET a SonarQube API endpoint and decode the JSON body, raising on HTTP errors."""
+    response = session.get(url, params=params, auth=auth_tuple)
+    response.raise_for_status()
+    return _loads(response.content)
+
+
+def fetch_quality_gate_status(session: requests.Session, host: str, auth_tuple, project_key: str) -> Dict[str, Any]:
     """Fetch quality gate status for a project."""
     url = f"{host}/api/qualitygates/project_status"
     params = {"projectKey": project_key}
     
-    response = requests.get(url, params=params, auth=auth_tuple)
-    response.raise_for_status()
-    return response.json()
+    return _get_json(session, url, params, auth_tuple)
 
 
-def fetch_measures(host: str, auth_tuple, project_key: str) -> Dict[str, Any]:
+def fetch_measures(session: requests.Session, host: str, auth_tuple, project_key: str) -> Dict[str, Any]:
     """Fetch project measures/metrics."""
     url = f"{host}/api/measures/component"
     params = {
         "component": project_key,
-        "metricKeys": "coverage,bugs,vulnerabilities,code_smells,duplicated_lines_density,lines,lines_to_cover"
+        "metricKeys": "coverage,bugs,vulnerabilities,code_smells,duplicated_lines_density"
     }
     
-    response = requests.get(url, params=params, auth=auth_tuple)
-    response.raise_for_status()
-    return response.json()
+    return _get_json(session, url, params, auth_tuple)
 
 
-def fetch_issues(host: str, auth_tuple, project_key: str) -> Dict[str, Any]:
-    """Fetch project issues."""
+def _issue_view(issue: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only the issue fields the reports use."""
+    return {
+        "key": issue.get("key"),
+        "rule": issue.get("rule"),
+        "severity": issue.get("severity", "UNKNOWN"),
+        "type": issue.get("type"),
+        "component": issue.get("component", ""),
+        "line": issue.get("line"),
+        "message": issue.get("message"),
+        "effort": issue.get("effort"),
+        "textRange": issue.get("textRange", {}),
+        "tags": issue.get("tags", [])
+    }
+
+
+def fetch_issues(session: requests.Session, host: str, auth_tuple, project_key: str) -> Dict[str, Any]:
+    """Fetch project issues as trimmed views, requesting any remaining pages concurrently."""
     url = f"{host}/api/issues/search"
     params = {
         "projectKeys": project_key,
         "resolved": "false",
-        "ps": 500
+        "ps": ISSUES_PAGE_SIZE,
+        # A fixed sort keeps pages consistent while they are fetched concurrently
+        "s": "SEVERITY",
+        "asc": "false"
     }
     
-    response = requests.get(url, params=params, auth=auth_tuple)
-    response.raise_for_status()
-    return response.json()
+    def fetch_page(page: int) -> Dict[str, Any]:
+        return _get_json(session, url, {**params, "p": page}, auth_tuple)
+    
+    data = fetch_page(1)
+    paging = data.get("paging", {})
+    total = paging.get("total", data.get("total", 0))
+    page_size = paging.get("pageSize", ISSUES_PAGE_SIZE)
+    page_count = math.ceil(total / page_size)
+    issues = [_issue_view(issue) for issue in data.get("issues", [])]
+    
+    max_pages = ISSUES_MAX_RESULTS // page_size
+    if page_count > max_pages:
+        print(f"⚠️  Project has {total} issues; only the first {ISSUES_MAX_RESULTS} can be fetched")
+        page_count = max_pages
+    
+    if page_count > 1:
+        with ThreadPoolExecutor(max_workers=min(page_count - 1, 8)) as executor:
+            for page_data in executor.map(fetch_page, range(2, page_count + 1)):
+                issues.extend(_issue_view(issue) for issue in page_data.get("issues", []))
+    
+    return {"total": total, "issues": issues}
 
 
-def extract_metric_value(measures: Dict, metric_key: str) -> Optional[float]:
-    """Extract metric value from measures response."""
-    try:
-        for measure in measures.get("component", {}).get("measures", []):
-            if measure.get("metric") == metric_key:
-                value = measure.get("value")
-                return float(value) if value else 0.0
-    except (KeyError, ValueError, TypeError):
-        pass
-    return 0.0
+def extract_metric_values(measures: Dict) -> Dict[str, float]:
+    """Map each metric key in a measures response to its value."""
+    values = {}
+    for measure in measures.get("component", {}).get("measures", []):
+        value = measure.get("value")
+        try:
+            values[measure.get("metric")] = float(value) if value else 0.0
+        except (ValueError, TypeError):
+            values[measure.get("metric")] = 0.0
+    return values
 
 
-def get_code_context(file_path: str, line_number: int, context_lines: int = 3) -> Dict[str, Any]:
-    """Get code context around a specific line number."""
+# Component paths already known not to exist locally (lru_cache does not cache failures)
+_MISSING_FILES = set()
+
+
+@lru_cache(maxsize=256)
+def _load_lines(full_path: str) -> Tuple[str, ...]:
+    """Read a source file once and cache its lines without trailing newlines."""
+    with open(full_path, 'r', encoding='utf-8') as f:
+        return tuple(line.rstrip('\n') for line in f)
+
+
+def _load_source_lines(file_path: str) -> Tuple[str, ...]:
+    """Load a component's lines from sample-project, falling back to the relative path."""
     try:
-        # Try to read from sample-project directory
-        import os
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(os.path.dirname(script_dir))
-        full_path = os.path.join(project_root, "sample-project", file_path)
-        
-        if not os.path.exists(full_path):
-            # Try relative path
-            full_path = file_path
-            if not os.path.exists(full_path):
-                return {"error": f"File not found: {file_path}"}
-        
-        with open(full_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        start_line = max(0, line_number - context_lines - 1)
-        end_line = min(len(lines), line_number + context_lines)
-        
-        context = []
-        for i in range(start_line, end_line):
-            context.append({
-                "line": i + 1,
-                "code": lines[i].rstrip('\n'),
-                "is_issue_line": (i + 1) == line_number
-            })
-        
-        return {
-            "file": file_path,
-            "issue_line": line_number,
-            "context": context,
-            "start_line": start_line + 1,
-            "end_line": end_line
+        return _load_lines(os.path.join(_SAMPLE_ROOT, file_path))
+    except FileNotFoundError:
+        return _load_lines(file_path)
+
+
+def _build_context(file_path: str, lines: Tuple[str, ...], line_number: int,
+                   context_lines: int) -> Dict[str, Any]:
+    """Slice the code context around a line out of already loaded file lines."""
+    start_line = max(0, line_number - context_lines - 1)
+    end_line = min(len(lines), line_number + context_lines)
+    
+    context = [
+        {
+            "line": i + 1,
+            "code": code,
+            "is_issue_line": (i + 1) == line_number
         }
+        for i, code in enumerate(lines[start_line:end_line], start_line)
+    ]
+    
+    return {
+        "file": file_path,
+        "issue_line": line_number,
+        "context": context,
+        "start_line": start_line + 1,
+        "end_line": end_line
+    }
+
+
+def get_code_contexts(file_path: str, line_numbers: List[int], context_lines: int = 3) -> List[Dict[str, Any]]:
+    """Get code context for several lines of one file, reading the file once."""
+    if file_path in _MISSING_FILES:
+        return [{"error": f"File not found: {file_path}"} for _ in line_numbers]
+    
+    try:
+        lines = _load_source_lines(file_path)
+    except FileNotFoundError:
+        _MISSING_FILES.add(file_path)
+        return [{"error": f"File not found: {file_path}"} for _ in line_numbers]
     except Exception as e:
-        return {"error": str(e)}
+        return [{"error": str(e)} for _ in line_numbers]
+    
+    return [_build_context(file_path, lines, line_number, context_lines) for line_number in line_numbers]
 
 
-def generate_json_report(data: Dict[str, Any], output_file: str = "report.json"):
-    """Generate JSON report."""
-    with open(output_file, 'w') as f:
-        json.dump(data, f, indent=2)
+def get_code_context(file_path: str, line_number: int, context_lines: int = 3) -> Dict[str, Any]:
+    """Get code context around a specific line number."""
+    return get_code_contexts(file_path, [line_number], context_lines)[0]
+
+
+def _dumps(data: Dict[str, Any], pretty: bool = False) -> bytes:
+    """Serialize report data to JSON bytes, compact unless pretty is set."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+    if pretty:
+        return json.dumps(data, indent=2).encode('utf-8')
+    return json.dumps(data, separators=(",", ":")).encode('utf-8')
+
+
+def generate_json_report(data: Dict[str, Any], output_file: str = "report.json", pretty: bool = False,
+                         include_context: bool = True):
+    """Generate JSON report, optionally leaving out each issue's code context."""
+    if not include_context:
+        issues = data.get("issues", {})
+        detailed = [
+            {key: value for key, value in issue.items() if key != "codeContext"}
+            for issue in issues.get("detailed", [])
+        ]
+        data = {**data, "issues": {**issues, "detailed": detailed}}
+    
+    with open(output_file, 'wb') as f:
+        f.write(_dumps(data, pretty))
     print(f"📄 JSON report saved to: {output_file}")
 
 
+def _escape_html(value: Any) -> str:
+    """Escape a value for safe inclusion in HTML text or attributes."""
+    return str(value).translate(_HTML_ESCAPE)
+
+
 def generate_html_report(data: Dict[str, Any], output_file: str = "report.html"):
     """Generate HTML report."""
     qg_status = data.get("quality_gate", {}).get("status", "UNKNOWN")
     measures = data.get("measures", {})
     issues = data.get("issues", {})
     
-    status_color = {
-        "OK": "#4CAF50",
-        "ERROR": "#F44336",
-        "WARN": "#FF9800",
-        "NONE": "#9E9E9E"
-    }.get(qg_status, "#9E9E9E")
+    status_color = STATUS_COLOR.get(qg_status, "#9E9E9E")
     
-    html = f"""<!DOCTYPE html>
+    parts = []
+    parts.append(f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>SonarQube Report - {data.get('project_key', 'Unknown')}</title>
+    <title>SonarQube Report - {_escape_html(data.get('project_key', 'Unknown'))}</title>
     <style>
         body {{
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
@@ -297,7 +442,7 @@ def generate_html_report(data: Dict[str, Any], output_file: str = "report.html")
 <body>
     <div class="container">
         <h1>SonarQube Quality Report</h1>
-        <div class="status-badge">Quality Gate: {qg_status}</div>
+        <div class="status-badge">Quality Gate: {_escape_html(qg_status)}</div>
         
         <div class="metrics-grid">
             <div class="metric-card">
@@ -357,20 +502,21 @@ def generate_html_report(data: Dict[str, Any], output_file: str = "report.html")
         </div>
         
         <div class="issues-section">
-            <h2>Detailed Issues</h2>"""
+            <h2>Detailed Issues</h2>""")
     
     # Add detailed issues with code blocks
     detailed_issues = issues.get('detailed', [])
     for issue in detailed_issues:
-        severity = issue.get('severity', 'UNKNOWN')
+        severity = _escape_html(issue.get('severity', 'UNKNOWN'))
         severity_class = f"severity-{severity.lower()}"
-        component = issue.get('component', 'Unknown')
-        line = issue.get('line', 'N/A')
-        message = issue.get('message', 'No message')
-        rule = issue.get('rule', 'Unknown')
+        component = _escape_html(issue.get('component', 'Unknown'))
+        line = _escape_html(issue.get('line', 'N/A'))
+        message = _escape_html(issue.get('message', 'No message'))
+        rule = _escape_html(issue.get('rule', 'Unknown'))
+        effort = _escape_html(issue.get('effort', 'N/A'))
         code_context = issue.get('codeContext', {})
         
-        html += f"""
+        parts.append(f"""
             <div class="issue-detail">
                 <div class="issue-header">
                     <span class="issue-severity {severity_class}">{severity}</span>
@@ -380,30 +526,30 @@ def generate_html_report(data: Dict[str, Any], output_file: str = "report.html")
                     <strong>{message}</strong>
                 </div>
                 <div class="issue-meta">
-                    Rule: {rule} | Effort: {issue.get('effort', 'N/A')}
-                </div>"""
+                    Rule: {rule} | Effort: {effort}
+                </div>""")
         
         # Add code block if available
         if code_context and 'context' in code_context and not code_context.get('error'):
-            html += """
-                <div class="code-block">"""
+            parts.append("""
+                <div class="code-block">""")
             for ctx_line in code_context['context']:
                 line_num = ctx_line['line']
-                code = ctx_line['code'].replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+                code = _escape_html(ctx_line['code'])
                 is_issue = ctx_line.get('is_issue_line', False)
                 line_class = 'issue-line' if is_issue else ''
-                html += f"""
+                parts.append(f"""
                     <div class="code-line">
                         <span class="line-number {line_class}">{line_num}</span>
                         <span class="code-content {line_class}">{code}</span>
-                    </div>"""
-            html += """
-                </div>"""
+                    </div>""")
+            parts.append("""
+                </div>""")
         
-        html += """
-            </div>"""
+        parts.append("""
+            </div>""")
     
-    html += f"""
+    parts.append(f"""
         </div>
         
         <div class="footer">
@@ -411,10 +557,10 @@ def generate_html_report(data: Dict[str, Any], output_file: str = "report.html")
         </div>
     </div>
 </body>
-</html>"""
+</html>""")
     
     with open(output_file, 'w') as f:
-        f.write(html)
+        f.write("".join(parts))
     print(f"🌐 HTML report saved to: {output_file}")
 
 
@@ -424,28 +570,25 @@ def print_slack_summary(data: Dict[str, Any]):
     measures = data.get("measures", {})
     issues = data.get("issues", {})
     
-    status_emoji = {
-        "OK": "✅",
-        "ERROR": "❌",
-        "WARN": "⚠️",
-        "NONE": "⚪"
-    }.get(qg_status, "❓")
+    status_emoji = STATUS_EMOJI.get(qg_status, "❓")
     
-    print("\n" + "="*60)
-    print("📱 SLACK-FORMATTED SUMMARY")
-    print("="*60)
-    print(f"{status_emoji} *Quality Gate Status:* {qg_status}")
-    print(f"📊 *Coverage:* {measures.get('coverage', 0):.1f}%")
-    print(f"🐛 *Bugs:* {measures.get('bugs', 0)}")
-    print(f"🔒 *Vulnerabilities:* {measures.get('vulnerabilities', 0)}")
-    print(f"💨 *Code Smells:* {measures.get('code_smells', 0)}")
-    print(f"📋 *Duplicated Lines:* {measures.get('duplicated_lines_density', 0):.1f}%")
-    print("\n*Issues by Severity:*")
+    out = []
+    out.append("\n" + "="*60)
+    out.append("📱 SLACK-FORMATTED SUMMARY")
+    out.append("="*60)
+    out.append(f"{status_emoji} *Quality Gate Status:* {qg_status}")
+    out.append(f"📊 *Coverage:* {measures.get('coverage', 0):.1f}%")
+    out.append(f"🐛 *Bugs:* {measures.get('bugs', 0)}")
+    out.append(f"🔒 *Vulnerabilities:* {measures.get('vulnerabilities', 0)}")
+    out.append(f"💨 *Code Smells:* {measures.get('code_smells', 0)}")
+    out.append(f"📋 *Duplicated Lines:* {measures.get('duplicated_lines_density', 0):.1f}%")
+    out.append("\n*Issues by Severity:*")
     for severity in ['BLOCKER', 'CRITICAL', 'MAJOR', 'MINOR', 'INFO']:
         count = issues.get('severity_counts', {}).get(severity, 0)
         if count > 0:
-            print(f"  • {severity}: {count}")
-    print("="*60 + "\n")
+            out.append(f"  • {severity}: {count}")
+    out.append("="*60 + "\n")
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 def print_email_summary(data: Dict[str, Any]):
@@ -454,23 +597,25 @@ def print_email_summary(data: Dict[str, Any]):
     measures = data.get("measures", {})
     issues = data.get("issues", {})
     
-    print("\n" + "="*60)
-    print("📧 EMAIL-FORMATTED SUMMARY")
-    print("="*60)
-    print(f"Quality Gate Status: {qg_status}")
-    print(f"Project: {data.get('project_key', 'Unknown')}")
-    print(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("\nMetrics:")
-    print(f"  - Coverage: {measures.get('coverage', 0):.1f}%")
-    print(f"  - Bugs: {measures.get('bugs', 0)}")
-    print(f"  - Vulnerabilities: {measures.get('vulnerabilities', 0)}")
-    print(f"  - Code Smells: {measures.get('code_smells', 0)}")
-    print(f"  - Duplicated Lines: {measures.get('duplicated_lines_density', 0):.1f}%")
-    print("\nIssues by Severity:")
+    out = []
+    out.append("\n" + "="*60)
+    out.append("📧 EMAIL-FORMATTED SUMMARY")
+    out.append("="*60)
+    out.append(f"Quality Gate Status: {qg_status}")
+    out.append(f"Project: {data.get('project_key', 'Unknown')}")
+    out.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    out.append("\nMetrics:")
+    out.append(f"  - Coverage: {measures.get('coverage', 0):.1f}%")
+    out.append(f"  - Bugs: {measures.get('bugs', 0)}")
+    out.append(f"  - Vulnerabilities: {measures.get('vulnerabilities', 0)}")
+    out.append(f"  - Code Smells: {measures.get('code_smells', 0)}")
+    out.append(f"  - Duplicated Lines: {measures.get('duplicated_lines_density', 0):.1f}%")
+    out.append("\nIssues by Severity:")
     for severity in ['BLOCKER', 'CRITICAL', 'MAJOR', 'MINOR', 'INFO']:
         count = issues.get('severity_counts', {}).get(severity, 0)
-        print(f"  - {severity}: {count}")
-    print("="*60 + "\n")
+        out.append(f"  - {severity}: {count}")
+    out.append("="*60 + "\n")
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 def print_detailed_issues(data: Dict[str, Any]):
@@ -481,9 +626,10 @@ def print_detailed_issues(data: Dict[str, Any]):
     if not detailed_issues:
         return
     
-    print("\n" + "="*80)
-    print("📋 DETAILED ISSUES WITH CODE CONTEXT")
-    print("="*80)
+    out = []
+    out.append("\n" + "="*80)
+    out.append("📋 DETAILED ISSUES WITH CODE CONTEXT")
+    out.append("="*80)
     
     for idx, issue in enumerate(detailed_issues, 1):
         severity = issue.get("severity", "UNKNOWN")
@@ -494,41 +640,35 @@ def print_detailed_issues(data: Dict[str, Any]):
         code_context = issue.get("codeContext", {})
         
         # Color based on severity
-        severity_colors = {
-            "BLOCKER": Colors.RED,
-            "CRITICAL": Colors.RED,
-            "MAJOR": Colors.YELLOW,
-            "MINOR": Colors.BLUE,
-            "INFO": Colors.BLUE
-        }
-        color = severity_colors.get(severity, Colors.RESET)
+        color = SEVERITY_COLORS.get(severity, Colors.RESET)
         
-        print(f"\n{color}[{severity}]{Colors.RESET} Issue #{idx}")
-        print(f"  File: {component}")
-        print(f"  Line: {line}")
-        print(f"  Rule: {rule}")
-        print(f"  Message: {message}")
+        out.append(f"\n{color}[{severity}]{Colors.RESET} Issue #{idx}")
+        out.append(f"  File: {component}")
+        out.append(f"  Line: {line}")
+        out.append(f"  Rule: {rule}")
+        out.append(f"  Message: {message}")
         
         # Print code context
         if code_context and 'context' in code_context and not code_context.get('error'):
-            print(f"\n  Code Context (lines {code_context.get('start_line', '?')}-{code_context.get('end_line', '?')}):")
-            print("  " + "-"*76)
+            out.append(f"\n  Code Context (lines {code_context.get('start_line', '?')}-{code_context.get('end_line', '?')}):")
+            out.append("  " + "-"*76)
             for ctx_line in code_context['context']:
                 line_num = ctx_line['line']
                 code = ctx_line['code']
                 is_issue = ctx_line.get('is_issue_line', False)
                 
                 if is_issue:
-                    print(f"  {Colors.RED}>>>{Colors.RESET} {line_num:4d} | {code}")
+                    out.append(f"  {Colors.RED}>>>{Colors.RESET} {line_num:4d} | {code}")
                 else:
-                    print(f"     {line_num:4d} | {code}")
-            print("  " + "-"*76)
+                    out.append(f"     {line_num:4d} | {code}")
+            out.append("  " + "-"*76)
         elif code_context.get('error'):
-            print(f"  {Colors.YELLOW}⚠️  Could not load code context: {code_context['error']}{Colors.RESET}")
+            out.append(f"  {Colors.YELLOW}⚠️  Could not load code context: {code_context['error']}{Colors.RESET}")
         
-        print()
+        out.append("")
     
-    print("="*80 + "\n")
+    out.append("="*80 + "\n")
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 def main():
@@ -547,6 +687,10 @@ def main():
                        help="JSON output file path")
     parser.add_argument("--html-output", default="report.html",
                        help="HTML output file path")
+    parser.add_argument("--pretty-json", action="store_true",
+                       help="Indent the JSON report (compact by default)")
+    parser.add_argument("--json-skip-context", action="store_true",
+                       help="Leave issue code context out of the JSON report")
     
     args = parser.parse_args()
     
@@ -569,56 +713,61 @@ def main():
     print(f"🌐 SonarQube host: {host}")
     
     try:
-        # Fetch data
-        print("📊 Fetching quality gate status...")
-        qg_data = fetch_quality_gate_status(host, auth_tuple, project_key)
-        
-        print("📈 Fetching measures...")
-        measures_data = fetch_measures(host, auth_tuple, project_key)
-        
-        print("🔎 Fetching issues...")
-        issues_data = fetch_issues(host, auth_tuple, project_key)
+        # Fetch data (the three requests are independent, so issue them concurrently)
+        print("📊 Fetching quality gate status, measures and issues...")
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            qg_future = executor.submit(fetch_quality_gate_status, SESSION, host, auth_tuple, project_key)
+            measures_future = executor.submit(fetch_measures, SESSION, host, auth_tuple, project_key)
+            issues_future = executor.submit(fetch_issues, SESSION, host, auth_tuple, project_key)
+            qg_data = qg_future.result()
+            measures_data = measures_future.result()
+            issues_data = issues_future.result()
         
         # Process measures
+        metric_values = extract_metric_values(measures_data)
         measures = {
-            "coverage": extract_metric_value(measures_data, "coverage"),
-            "bugs": int(extract_metric_value(measures_data, "bugs")),
-            "vulnerabilities": int(extract_metric_value(measures_data, "vulnerabilities")),
-            "code_smells": int(extract_metric_value(measures_data, "code_smells")),
-            "duplicated_lines_density": extract_metric_value(measures_data, "duplicated_lines_density")
+            "coverage": metric_values.get("coverage", 0.0),
+            "bugs": int(metric_values.get("bugs", 0.0)),
+            "vulnerabilities": int(metric_values.get("vulnerabilities", 0.0)),
+            "code_smells": int(metric_values.get("code_smells", 0.0)),
+            "duplicated_lines_density": metric_values.get("duplicated_lines_density", 0.0)
         }
         
         # Process issues with detailed information
-        severity_counts = {}
-        detailed_issues = []
+        raw_issues = issues_data.get("issues", [])
+        severity_counts = dict(Counter(issue["severity"] for issue in raw_issues))
+        
+        # Component keys look like "<project_key>:<path>"; keep just the path
+        component_prefix = f"{project_key}:"
+        components = []
+        for issue in raw_issues:
+            component = issue["component"]
+            if component.startswith(component_prefix):
+                component = component[len(component_prefix):]
+            components.append(component)
+        
+        # Group issues by file so each source file is resolved and sliced in one pass
+        issues_by_file = defaultdict(list)
+        for idx, issue in enumerate(raw_issues):
+            if issue.get("line") and components[idx]:
+                issues_by_file[components[idx]].append(idx)
+        
+        def load_file_contexts(item):
+            component, indices = item
+            return get_code_contexts(component, [raw_issues[idx]["line"] for idx in indices])
+        
+        # Source files are independent, so read them on a thread pool
+        code_contexts = [{} for _ in raw_issues]
+        with ThreadPoolExecutor() as executor:
+            file_contexts = executor.map(load_file_contexts, issues_by_file.items())
+            for indices, contexts in zip(issues_by_file.values(), file_contexts):
+                for idx, code_context in zip(indices, contexts):
+                    code_contexts[idx] = code_context
         
-        for issue in issues_data.get("issues", []):
-            severity = issue.get("severity", "UNKNOWN")
-            severity_counts[severity] = severity_counts.get(severity, 0) + 1
-            
-            # Extract detailed issue information
-            component = issue.get("component", "").replace(f"{project_key}:", "")
-            line_number = issue.get("line")
-            
-            # Get code context
-            code_context = {}
-            if line_number and component:
-                code_context = get_code_context(component, line_number)
-            
-            issue_detail = {
-                "key": issue.get("key"),
-                "rule": issue.get("rule"),
-                "severity": severity,
-                "type": issue.get("type"),
-                "component": component,
-                "line": line_number,
-                "message": issue.get("message"),
-                "effort": issue.get("effort"),
-                "textRange": issue.get("textRange", {}),
-                "tags": issue.get("tags", []),
-                "codeContext": code_context
-            }
-            detailed_issues.append(issue_detail)
+        detailed_issues = [
+            {**issue, "component": component, "codeContext": code_context}
+            for issue, component, code_context in zip(raw_issues, components, code_contexts)
+        ]
         
         issues = {
             "total": issues_data.get("total", 0),
@@ -639,7 +788,8 @@ def main():
         }
         
         # Generate reports
-        generate_json_report(report_data, args.json_output)
+        generate_json_report(report_data, args.json_output, args.pretty_json,
+                             include_context=not args.json_skip_context)
         generate_html_report(report_data, args.html_output)
         
         # Print summaries
@@ -4,135 +4,272 @@
 import requests
 import sys
 import json
+import logging
+import os
+import random
+import re
+import shutil
+import socket
+import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlsplit
+from urllib3.exceptions import NewConnectionError
+from urllib3.util.retry import Retry
+
+try:
+    from orjson import loads as _loads
+except ImportError:  # orjson is an optional speedup; fall back to the stdlib
+    from json import loads as _loads
+
+def pin_host(url):
+    """Resolve a plain-HTTP URL's hostname once; returns (IP-based URL, original Host header)"""
+    parts = urlsplit(url)
+    if parts.scheme != "http" or not parts.hostname:
+        return url, None  # TLS certificates are checked against the hostname, so leave https alone
+    try:
+        addr = socket.gethostbyname(parts.hostname)
+    except OSError:
+        return url, None
+    netloc = addr if parts.port is None else f"{addr}:{parts.port}"
+    return parts._replace(netloc=netloc).geturl(), parts.netloc
 
 SONAR_HOST = "http://localhost:9000"
+# Resolve the host once up front so each new connection skips the DNS lookup
+API_HOST, HOST_HEADER = pin_host(SONAR_HOST)
+STATUS_URL = f"{API_HOST}/api/system/status"
+SEARCH_URL = f"{API_HOST}/api/projects/search"
+CREATE_URL = f"{API_HOST}/api/projects/create"
+REVOKE_URL = f"{API_HOST}/api/user_tokens/revoke"
+GENERATE_URL = f"{API_HOST}/api/user_tokens/generate"
 ADMIN_USER = "admin"
 ADMIN_PASS = "admin"
 PROJECT_KEY = "sample-project"
 PROJECT_NAME = "sample-project"
 TOKEN_NAME = "local-scan-token"
 
-def wait_for_sonar():
+log = logging.getLogger(__name__)
+
+# Readiness polling: total time budget and exponential backoff bounds (seconds)
+READY_TIMEOUT = 120
+INITIAL_DELAY = 0.25
+MAX_DELAY = 4.0
+REFUSED_DELAY = 0.2
+
+# Matches the "UP" status in the raw system/status body without decoding JSON
+STATUS_UP = re.compile(rb'"status"\s*:\s*"UP"')
+
+def create_session():
+    """Create an authenticated session that reuses keep-alive connections"""
+    session = requests.Session()
+    session.auth = (ADMIN_USER, ADMIN_PASS)
+    # SONAR_HOST is a fixed local URL, so skip re-reading proxy/netrc/CA settings from the environment per request
+    session.trust_env = False
+    if HOST_HEADER:
+        session.headers["Host"] = HOST_HEADER
+    # urllib3 already opens sockets with TCP_NODELAY, so the small API requests aren't held back by Nagle
+    # No urllib3 retries (the readiness loop retries itself); read=False lets read timeouts
+    # surface as requests' Timeout instead of being wrapped into a ConnectionError
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2, max_retries=Retry(total=0, read=False))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def sonar_is_up(session, timeout):
+    """Probe SonarQube's status endpoint once; request errors propagate"""
+    resp = session.get(STATUS_URL, timeout=timeout)
+    return resp.status_code == 200 and STATUS_UP.search(resp.content) is not None
+
+def connection_refused(exc):
+    """Check whether a requests ConnectionError came from a refused TCP connection"""
+    reason = getattr(exc.args[0], "reason", None) if exc.args else None
+    if not isinstance(reason, NewConnectionError):
+        return False
+    cause = reason.__cause__ or reason.__context__
+    return isinstance(cause, ConnectionRefusedError)
+
+def wait_for_sonar(session):
     """Wait for SonarQube to be ready"""
-    print("⏳ Waiting for SonarQube to be ready...")
-    for i in range(30):
+    log.info("⏳ Waiting for SonarQube to be ready...")
+    deadline = time.monotonic() + READY_TIMEOUT
+    delay = INITIAL_DELAY
+    # Fast first probe: an already running server (e.g. a CI re-run) answers right away
+    timeout = 1
+    while True:
+        backoff = True
         try:
-            resp = requests.get(f"{SONAR_HOST}/api/system/status", timeout=5)
-            if resp.status_code == 200:
-                data = resp.json()
-                if data.get("status") == "UP":
-                    print("✅ SonarQube is ready!")
-                    return True
-        except:
+            if sonar_is_up(session, timeout):
+                log.info("✅ SonarQube is ready!")
+                return True
+        except requests.exceptions.Timeout:
+            pass
+        except requests.exceptions.ConnectionError as e:
+            # Refused connections fail instantly while the port isn't bound yet; retry soon.
+            # Anything else (DNS failures, resets) backs off like other errors.
+            backoff = not connection_refused(e)
+        except requests.exceptions.RequestException:
             pass
-        time.sleep(2)
-    return False
+        
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        # Back off exponentially, with jitter so parallel runs don't probe in lockstep
+        wait = delay if backoff else REFUSED_DELAY
+        time.sleep(min(wait + random.uniform(0, wait * 0.1), remaining))
+        if backoff:
+            delay = min(delay * 2, MAX_DELAY)
+        timeout = 2
+
+def response_excerpt(resp, limit=512):
+    """Decode only the start of a response body, for error checks and messages"""
+    return resp.content[:limit].decode("utf-8", "replace")
+
+def project_exists(session):
+    """Check whether the project is already registered in SonarQube"""
+    try:
+        resp = session.get(SEARCH_URL, params={"projects": PROJECT_KEY})
+        if resp.status_code != 200:
+            return False
+        return any(c.get("key") == PROJECT_KEY for c in _loads(resp.content).get("components", []))
+    except (requests.exceptions.RequestException, ValueError):
+        return False
 
 def create_project(session):
-    """Create project in SonarQube"""
-    print(f"📦 Creating project '{PROJECT_NAME}'...")
+    """Create project in SonarQube unless it already exists"""
+    # Repeat runs find the project already there and skip the create POST
+    if project_exists(session):
+        log.info("ℹ️  Project '%s' already exists (this is fine)", PROJECT_NAME)
+        return True
+    
+    log.info("📦 Creating project '%s'...", PROJECT_NAME)
     try:
         # Try the web API endpoint
         resp = session.post(
-            f"{SONAR_HOST}/api/projects/create",
+            CREATE_URL,
             data={"project": PROJECT_KEY, "name": PROJECT_NAME}
         )
         if resp.status_code in [200, 201]:
-            print("✅ Project created successfully")
+            log.info("✅ Project created successfully")
             return True
-        elif "already exists" in resp.text.lower() or resp.status_code == 400:
-            print("ℹ️  Project already exists (this is fine)")
+        
+        body = response_excerpt(resp)
+        if resp.status_code == 400 or "already exists" in body.lower():
+            log.info("ℹ️  Project already exists (this is fine)")
             return True
         else:
-            print(f"⚠️  Project creation response: {resp.status_code}")
-            print(resp.text[:200])
+            log.warning("⚠️  Project creation response: %s", resp.status_code)
+            log.warning("%s", body[:200])
             return False
     except Exception as e:
-        print(f"⚠️  Error creating project: {e}")
+        log.warning("⚠️  Error creating project: %s", e)
+        return False
+
+def token_name_taken(resp):
+    """Check whether a generate response is SonarQube's duplicate token name error"""
+    if resp.status_code != 400:
         return False
+    try:
+        errors = _loads(resp.content).get("errors", [])
+    except ValueError:
+        return False
+    # e.g. "A user token for login 'admin' and name 'local-scan-token' already exists"
+    return any(f"name '{TOKEN_NAME}' already exists" in error.get("msg", "") for error in errors)
 
 def generate_token(session):
     """Generate authentication token"""
-    print(f"🔑 Generating token '{TOKEN_NAME}'...")
+    log.info("🔑 Generating token '%s'...", TOKEN_NAME)
+    
+    def request_token():
+        return session.post(
+            GENERATE_URL,
+            data={"name": TOKEN_NAME, "type": "GLOBAL_ANALYSIS_TOKEN"}
+        )
+    
     try:
-        # First, try to revoke existing token if it exists
-        try:
+        # Generate new token; only revoke first if one with this name already exists
+        resp = request_token()
+        if token_name_taken(resp):
+            log.info("ℹ️  Token '%s' already exists, replacing it", TOKEN_NAME)
             session.post(
-                f"{SONAR_HOST}/api/user_tokens/revoke",
+                REVOKE_URL,
                 data={"name": TOKEN_NAME}
             )
-        except:
-            pass
-        
-        # Generate new token
-        resp = session.post(
-            f"{SONAR_HOST}/api/user_tokens/generate",
-            data={"name": TOKEN_NAME, "type": "GLOBAL_ANALYSIS_TOKEN"}
-        )
+            resp = request_token()
         
         if resp.status_code == 200:
-            data = resp.json()
+            data = _loads(resp.content)
             token = data.get("token")
             if token:
-                print(f"✅ Token generated: {token[:20]}...")
+                log.info("✅ Token generated: %s...", token[:20])
                 return token
         else:
-            print(f"⚠️  Token generation failed: {resp.status_code}")
-            print(resp.text[:200])
+            log.warning("⚠️  Token generation failed: %s", resp.status_code)
+            log.warning("%s", response_excerpt(resp)[:200])
             return None
     except Exception as e:
-        print(f"❌ Error generating token: {e}")
+        log.error("❌ Error generating token: %s", e)
         return None
 
 def update_properties_file(token):
     """Update sonar-project.properties with token"""
     prop_file = "sample-project/sonar-project.properties"
+    tmp_name = None
     try:
-        with open(prop_file, 'r') as f:
-            content = f.read()
-        
-        content = content.replace("<TOKEN_PLACEHOLDER>", token)
+        # Stream into a temp file beside the original, then swap it in atomically
+        with open(prop_file, 'r') as src, tempfile.NamedTemporaryFile(
+                'w', dir=os.path.dirname(prop_file) or ".", delete=False) as tmp:
+            tmp_name = tmp.name
+            for line in src:
+                tmp.write(line.replace("<TOKEN_PLACEHOLDER>", token))
         
-        with open(prop_file, 'w') as f:
-            f.write(content)
+        shutil.copymode(prop_file, tmp_name)
+        os.replace(tmp_name, prop_file)
         
-        print(f"✅ Updated {prop_file} with token")
+        log.info("✅ Updated %s with token", prop_file)
         return True
     except Exception as e:
-        print(f"❌ Error updating properties file: {e}")
+        if tmp_name and os.path.exists(tmp_name):
+            os.remove(tmp_name)
+        log.error("❌ Error updating properties file: %s", e)
         return False
 
 def main():
-    if not wait_for_sonar():
-        print("❌ SonarQube did not become ready in time")
-        sys.exit(1)
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
     
-    # Create session with authentication
-    session = requests.Session()
-    session.auth = (ADMIN_USER, ADMIN_PASS)
-    
-    # Create project
-    create_project(session)
+    # One authenticated session shared by the readiness probe and all API calls,
+    # closed (along with its pooled connections) once they are done
+    with create_session() as session:
+        if not wait_for_sonar(session):
+            log.error("❌ SonarQube did not become ready in time")
+            sys.exit(1)
+        
+        # Create project and generate token concurrently; they don't depend on each other
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            project_future = executor.submit(create_project, session)
+            token_future = executor.submit(generate_token, session)
+            project_future.result()
+            token = token_future.result()
     
-    # Generate token
-    token = generate_token(session)
     if not token:
-        print("\n❌ Failed to generate token automatically.")
-        print("💡 You may need to:")
-        print("   1. Login to http://localhost:9000 (admin/admin)")
-        print("   2. Change password if prompted")
-        print("   3. Create project manually: " + PROJECT_KEY)
-        print("   4. Generate token manually: " + TOKEN_NAME)
-        print("   5. Update sample-project/sonar-project.properties")
+        log.error(
+            "\n❌ Failed to generate token automatically.\n"
+            "💡 You may need to:\n"
+            "   1. Login to %s (admin/admin)\n"
+            "   2. Change password if prompted\n"
+            "   3. Create project manually: %s\n"
+            "   4. Generate token manually: %s\n"
+            "   5. Update sample-project/sonar-project.properties",
+            SONAR_HOST, PROJECT_KEY, TOKEN_NAME
+        )
         sys.exit(1)
     
     # Update properties file
     if update_properties_file(token):
-        print(f"\n✅ Setup complete! Token: {token}")
+        log.info("\n✅ Setup complete! Token: %s", token)
         return token
     else:
-        print(f"\n⚠️  Setup partially complete. Token: {token}")
+        log.warning("\n⚠️  Setup partially complete. Token: %s", token)
         return token
 
 if __name__ == "__main__":